@@ -32,6 +32,9 @@ const packageJson = JSON.parse(
   await fs.readFile(path.join(__dirname, '..', 'package.json'), 'utf-8')
 );
 
+// How long a generated system prompt is served before being rebuilt
+const SYSTEM_PROMPT_TTL_MS = 5000;
+
 const program = new Command();
 
 program
@@ -145,14 +148,17 @@ async function startStdioServer(options: any) {
   // Register all tools
   console.error(`Registering ${allTools.length} tools...`);
 
+  // Tool descriptors never change while serving, so build them once
+  const toolDescriptors = allTools.map(tool => ({
+    name: tool.name,
+    description: tool.description,
+    inputSchema: tool.inputSchema
+  }));
+
   // Handle tool listing
   server.setRequestHandler(ListToolsRequestSchema, async () => {
     return {
-      tools: allTools.map(tool => ({
-        name: tool.name,
-        description: tool.description,
-        inputSchema: tool.inputSchema
-      }))
+      tools: toolDescriptors
     };
   });
 
@@ -198,9 +204,29 @@ async function startStdioServer(options: any) {
     };
   });
 
+  // Reuse a recently generated system prompt; building one spawns git and
+  // probes the project on disk. A build in progress is shared by all callers
+  // and only starts to expire once it has finished.
+  let systemPromptCache: { text: Promise<string>; expires: number } | null = null;
+
   server.setRequestHandler(ReadResourceRequestSchema, async (request) => {
     if (request.params.uri === 'hanzo://system-prompt') {
-      const systemPrompt = await getSystemPrompt(options.project);
+      if (!systemPromptCache || Date.now() >= systemPromptCache.expires) {
+        const entry = {
+          text: getSystemPrompt(options.project),
+          expires: Infinity
+        };
+        entry.text.then(
+          () => {
+            entry.expires = Date.now() + SYSTEM_PROMPT_TTL_MS;
+          },
+          () => {
+            if (systemPromptCache === entry) systemPromptCache = null;
+          }
+        );
+        systemPromptCache = entry;
+      }
+      const systemPrompt = await systemPromptCache.text;
       return {
         contents: [{
           uri: request.params.uri,
@@ -48,6 +48,9 @@ export async function createMCPServer(config?: {
   const combinedTools = [...allTools, ...customTools];
   const combinedToolMap = new Map(combinedTools.map(t => [t.name, t]));
   
+  // Cached tool descriptors, rebuilt lazily after addTool/removeTool
+  let toolDescriptors: Array<Pick<Tool, 'name' | 'description' | 'inputSchema'>> | null = null;
+  
   const server = new Server(
     { name, version },
     {
@@ -60,12 +63,15 @@ export async function createMCPServer(config?: {
   
   // Handle tool listing
   server.setRequestHandler(ListToolsRequestSchema, async () => {
-    return {
-      tools: combinedTools.map(tool => ({
+    if (!toolDescriptors) {
+      toolDescriptors = combinedTools.map(tool => ({
         name: tool.name,
         description: tool.description,
         inputSchema: tool.inputSchema
-      }))
+      }));
+    }
+    return {
+      tools: toolDescriptors
     };
   });
   
@@ -110,6 +116,7 @@ export async function createMCPServer(config?: {
     addTool(tool: Tool) {
       combinedTools.push(tool);
       combinedToolMap.set(tool.name, tool);
+      toolDescriptors = null;
     },
     
     removeTool(name: string) {
@@ -117,6 +124,7 @@ export async function createMCPServer(config?: {
       if (index >= 0) {
         combinedTools.splice(index, 1);
         combinedToolMap.delete(name);
+        toolDescriptors = null;
       }
     }
   };
@@ -10,6 +10,23 @@ import * as os from 'os';
 
 const execAsync = promisify(exec);
 
+// Parsed package.json files keyed by path, reused while the mtime and size
+// are unchanged. The mtime is compared in nanoseconds; millisecond precision
+// misses edits made in quick succession.
+const packageJsonCache = new Map<string, { mtimeNs: bigint; size: bigint; data: any }>();
+
+async function readPackageJson(file: string): Promise<any> {
+  const { mtimeNs, size } = await fs.stat(file, { bigint: true });
+  const cached = packageJsonCache.get(file);
+  if (cached && cached.mtimeNs === mtimeNs && cached.size === size) {
+    return cached.data;
+  }
+
+  const data = JSON.parse(await fs.readFile(file, 'utf-8'));
+  packageJsonCache.set(file, { mtimeNs, size, data });
+  return data;
+}
+
 export async function getSystemPrompt(projectPath: string = process.cwd()): Promise<string> {
   const parts: string[] = [];
   
@@ -27,9 +44,16 @@ export async function getSystemPrompt(projectPath: string = process.cwd()): Prom
   
   // Git Status
   try {
-    const { stdout: gitStatus } = await execAsync('git status --porcelain', { cwd: projectPath });
-    const { stdout: gitBranch } = await execAsync('git branch --show-current', { cwd: projectPath });
-    const { stdout: gitRemote } = await execAsync('git remote -v', { cwd: projectPath });
+    // Spawn the git queries together rather than waiting on each in turn
+    const [
+      { stdout: gitStatus },
+      { stdout: gitBranch },
+      { stdout: gitRemote }
+    ] = await Promise.all([
+      execAsync('git status --porcelain', { cwd: projectPath }),
+      execAsync('git branch --show-current', { cwd: projectPath }),
+      execAsync('git remote -v', { cwd: projectPath })
+    ]);
     
     parts.push('## Git Repository');
     parts.push(`- Branch: ${gitBranch.trim()}`);
@@ -71,15 +95,13 @@ export async function getSystemPrompt(projectPath: string = process.cwd()): Prom
       '.env.example'
     ];
     
-    const foundFiles: string[] = [];
-    for (const file of projectFiles) {
-      try {
-        await fs.access(path.join(projectPath, file));
-        foundFiles.push(file);
-      } catch {
-        // File doesn't exist
-      }
-    }
+    // Probe all candidates at once; results keep the list's order
+    const present = await Promise.all(
+      projectFiles.map(file =>
+        fs.access(path.join(projectPath, file)).then(() => true, () => false)
+      )
+    );
+    const foundFiles = projectFiles.filter((_, i) => present[i]);
     
     if (foundFiles.length > 0) {
       parts.push('- Project files found: ' + foundFiles.join(', '));
@@ -88,9 +110,7 @@ export async function getSystemPrompt(projectPath: string = process.cwd()): Prom
     // Detect project type
     if (foundFiles.includes('package.json')) {
       try {
-        const packageJson = JSON.parse(
-          await fs.readFile(path.join(projectPath, 'package.json'), 'utf-8')
-        );
+        const packageJson = await readPackageJson(path.join(projectPath, 'package.json'));
         parts.push(`- Node.js project: ${packageJson.name || 'unnamed'}`);
         if (packageJson.dependencies?.react) parts.push('- Framework: React');
         if (packageJson.dependencies?.vue) parts.push('- Framework: Vue');
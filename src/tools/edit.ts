@@ -11,6 +11,67 @@ interface Edit {
   newText: string;
 }
 
+// Find the first occurrence of text and count all non-overlapping ones in a
+// single indexOf scan, without allocating the pieces the way split() does
+function findText(content: string, text: string): { index: number; count: number } {
+  // An empty oldText never matches
+  const index = text ? content.indexOf(text) : -1;
+  let count = 0;
+  for (let i = index; i !== -1; i = content.indexOf(text, i + text.length)) {
+    count++;
+  }
+  return { index, count };
+}
+
+// Splice newText in place of the occurrence at index. Unlike
+// String.prototype.replace, '$' sequences in newText are kept literally.
+function replaceAt(content: string, index: number, oldText: string, newText: string): string {
+  return content.slice(0, index) + newText + content.slice(index + oldText.length);
+}
+
+// Errors meaning the file cannot be replaced through a sibling temp file,
+// e.g. in a read-only directory or for a bind-mounted single file. The file
+// itself may still be writable, so it is then overwritten in place.
+const IN_PLACE_WRITE_CODES = new Set(['EACCES', 'EPERM', 'EBUSY', 'EXDEV']);
+
+// Write content to a temporary file next to the target and rename it into
+// place, so a failed or interrupted write never leaves a half-written file.
+// Symlinks are followed and the original file mode is kept, as is the owner
+// when running as root.
+async function writeFileAtomic(filePath: string, content: string): Promise<void> {
+  const target = await fs.realpath(filePath);
+  const { mode, uid, gid } = await fs.stat(target);
+  const tmpPath = `${target}.${process.pid}.${Math.random().toString(36).slice(2)}.tmp`;
+  
+  let handle: fs.FileHandle;
+  try {
+    // Never reuse a file (or follow a symlink) already at the temp path
+    handle = await fs.open(tmpPath, 'wx', mode & 0o7777);
+  } catch (error: any) {
+    if (!IN_PLACE_WRITE_CODES.has(error.code)) throw error;
+    return fs.writeFile(target, content, 'utf8');
+  }
+  
+  try {
+    try {
+      await handle.writeFile(content, 'utf8');
+      if (process.getuid?.() === 0) await handle.chown(uid, gid);
+      await handle.sync();
+    } finally {
+      await handle.close();
+    }
+    await fs.chmod(tmpPath, mode & 0o7777);
+    await fs.rename(tmpPath, target).catch(async (error) => {
+      if (!IN_PLACE_WRITE_CODES.has(error.code)) throw error;
+      await fs.rm(tmpPath, { force: true });
+      await fs.writeFile(target, content, 'utf8');
+    });
+  } catch (error) {
+    await fs.rm(tmpPath, { force: true });
+    throw error;
+  }
+}
+
 export const editFileTool: Tool = {
   name: 'edit_file',
   description: 'Replace text in a file',
@@ -35,8 +96,9 @@ export const editFileTool: Tool = {
   handler: async (args) => {
     try {
       const content = await fs.readFile(args.path, 'utf8');
+      const { index, count: occurrences } = findText(content, args.oldText);
       
-      if (!content.includes(args.oldText)) {
+      if (occurrences === 0) {
         return {
           content: [{
             type: 'text',
@@ -46,8 +108,6 @@ export const editFileTool: Tool = {
         };
       }
       
-      // Count occurrences
-      const occurrences = content.split(args.oldText).length - 1;
       if (occurrences > 1) {
         return {
           content: [{
@@ -58,8 +118,16 @@ export const editFileTool: Tool = {
         };
       }
       
-      const newContent = content.replace(args.oldText, args.newText);
-      await fs.writeFile(args.path, newContent, 'utf8');
+      const newContent = replaceAt(content, index, args.oldText, args.newText);
+      if (newContent === content) {
+        return {
+          content: [{
+            type: 'text',
+            text: `No changes needed in ${args.path}: newText matches oldText`
+          }]
+        };
+      }
+      await writeFileAtomic(args.path, newContent);
       
       return {
         content: [{
@@ -112,26 +180,30 @@ export const multiEditTool: Tool = {
   },
   handler: async (args) => {
     try {
-      let content = await fs.readFile(args.path, 'utf8');
+      const original = await fs.readFile(args.path, 'utf8');
+      let content = original;
       const results = [];
       
-      for (const edit of args.edits) {
-        if (!content.includes(edit.oldText)) {
+      for (const edit of args.edits as Edit[]) {
+        const { index, count: occurrences } = findText(content, edit.oldText);
+        if (occurrences === 0) {
           results.push(`❌ oldText not found: "${edit.oldText.substring(0, 50)}..."`);
           continue;
         }
         
-        const occurrences = content.split(edit.oldText).length - 1;
         if (occurrences > 1) {
           results.push(`❌ oldText found ${occurrences} times: "${edit.oldText.substring(0, 50)}..."`);
           continue;
         }
         
-        content = content.replace(edit.oldText, edit.newText);
+        content = replaceAt(content, index, edit.oldText, edit.newText);
         results.push(`✓ Replaced: "${edit.oldText.substring(0, 30)}..." → "${edit.newText.substring(0, 30)}..."`);
       }
       
-      await fs.writeFile(args.path, content, 'utf8');
+      // Leave the file untouched if no edit applied or they cancelled out
+      if (content !== original) {
+        await writeFileAtomic(args.path, content);
+      }
       
       return {
         content: [{
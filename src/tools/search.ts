@@ -2,7 +2,7 @@
  * Search tools for Hanzo MCP
  */
 
-import { exec } from 'child_process';
+import { exec, spawn } from 'child_process';
 import { promisify } from 'util';
 import { glob } from 'glob';
 import * as fs from 'fs/promises';
@@ -11,14 +11,191 @@ import { Tool, ToolResult, SearchResult } from '../types';
 
 const execAsync = promisify(exec);
 
-// Check if ripgrep is available
-const hasRipgrep = async (): Promise<boolean> => {
-  try {
-    await execAsync('which rg');
-    return true;
-  } catch {
-    return false;
+// Check if ripgrep is available (looked up once per process)
+let ripgrepCheck: Promise<boolean> | undefined;
+
+const hasRipgrep = (): Promise<boolean> => {
+  if (!ripgrepCheck) {
+    ripgrepCheck = execAsync('which rg').then(() => true, () => false);
   }
+  return ripgrepCheck;
+};
+
+// Upper bound on search output returned to the client
+const MAX_OUTPUT_BYTES = 1024 * 1024;
+
+// Longest line printed in full; longer ones (minified bundles, data blobs)
+// are shown as a preview instead
+const MAX_LINE_BYTES = 200;
+
+// Keep ripgrep away from pathological inputs: preview very long lines
+// instead of printing them in full, and skip huge files such as logs or disk
+// images outright. grep has no equivalent flags, so runSearch cuts its long
+// lines itself.
+const RIPGREP_GUARD_ARGS = [
+  '--max-columns', String(MAX_LINE_BYTES),
+  '--max-columns-preview',
+  '--max-filesize', '100M'
+];
+
+// Appended to a line cut at maxColumns bytes
+const LINE_CUT_MARKER = Buffer.from(' [...]');
+const NEWLINE = Buffer.from('\n');
+
+interface SearchLimits {
+  maxLines?: number;
+  maxColumns?: number;
+}
+
+interface SearchOutput {
+  stdout: string;
+  stderr: string;
+  code: number | null;
+  truncated: boolean;
+  stopped: boolean;
+}
+
+// Length of the longest prefix of buf that does not end partway through a
+// UTF-8 encoded character
+const utf8Boundary = (buf: Buffer): number => {
+  let start = buf.length - 1;
+  // Step back over continuation bytes (10xxxxxx) to the sequence's lead byte
+  while (start > 0 && buf.length - start < 4 && (buf[start] & 0xc0) === 0x80) {
+    start--;
+  }
+  if (start < 0) return 0;
+  
+  const lead = buf[start];
+  const needed = lead >= 0xf0 ? 4 : lead >= 0xe0 ? 3 : lead >= 0xc0 ? 2 : 1;
+  return buf.length - start < needed ? start : buf.length;
+};
+
+// Run a search command and consume its output as it streams in. The process
+// is stopped once maxLines lines or MAX_OUTPUT_BYTES bytes have been
+// collected, rather than buffering everything it prints. Lines longer than
+// maxColumns bytes are cut short. Output is kept as raw chunks and decoded
+// once at the end.
+const runSearch = (
+  command: string,
+  commandArgs: string[],
+  { maxLines, maxColumns }: SearchLimits = {}
+): Promise<SearchOutput> => {
+  return new Promise((resolve, reject) => {
+    const proc = spawn(command, commandArgs, { stdio: ['ignore', 'pipe', 'pipe'] });
+    const stdoutChunks: Buffer[] = [];
+    const stderrChunks: Buffer[] = [];
+    // Pieces of the line currently being read, which may span chunks
+    let partial: Buffer[] = [];
+    let partialBytes = 0;
+    let lineCut = false;
+    let bytes = 0;
+    let stderrBytes = 0;
+    let lines = 0;
+    let truncated = false;
+    let stopped = false;
+    
+    // Output is only ever kept in whole lines, so a cut always falls just
+    // after the last newline collected. The one exception is output whose
+    // first line alone exceeds the cap: that line is kept up to the cap,
+    // ending on a character boundary.
+    const collectLine = (line: Buffer) => {
+      if (bytes + line.length > MAX_OUTPUT_BYTES) {
+        if (bytes === 0) {
+          line = line.subarray(0, MAX_OUTPUT_BYTES);
+          line = line.subarray(0, utf8Boundary(line));
+          stdoutChunks.push(line);
+          bytes += line.length;
+        }
+        truncated = true;
+        stopped = true;
+        return;
+      }
+      
+      stdoutChunks.push(line);
+      bytes += line.length;
+      if (maxLines !== undefined && ++lines >= maxLines) stopped = true;
+    };
+    
+    const appendPartial = (piece: Buffer) => {
+      if (lineCut) return;
+      partial.push(piece);
+      partialBytes += piece.length;
+      if (maxColumns === undefined) return;
+      
+      // Past the column limit keep a preview of the line and drop the rest
+      // of it as it arrives
+      const length = piece[piece.length - 1] === 0x0a ? partialBytes - 1 : partialBytes;
+      if (length > maxColumns) {
+        const head = Buffer.concat(partial, partialBytes).subarray(0, maxColumns);
+        partial = [head.subarray(0, utf8Boundary(head)), LINE_CUT_MARKER];
+        partialBytes = partial[0].length + LINE_CUT_MARKER.length;
+        lineCut = true;
+      }
+    };
+    
+    const flushPartial = (ended: boolean) => {
+      if (lineCut && ended) {
+        partial.push(NEWLINE);
+        partialBytes += NEWLINE.length;
+      }
+      const line = partial.length === 1 ? partial[0] : Buffer.concat(partial, partialBytes);
+      partial = [];
+      partialBytes = 0;
+      lineCut = false;
+      collectLine(line);
+    };
+    
+    proc.stdout.on('data', (chunk: Buffer) => {
+      if (stopped) return;
+      
+      let start = 0;
+      let newline: number;
+      while (!stopped && (newline = chunk.indexOf(0x0a, start)) !== -1) {
+        appendPartial(chunk.subarray(start, newline + 1));
+        flushPartial(true);
+        start = newline + 1;
+      }
+      
+      if (!stopped && start < chunk.length) {
+        appendPartial(chunk.subarray(start));
+        // A line that can no longer fit need not be buffered any further
+        if (bytes + partialBytes > MAX_OUTPUT_BYTES) flushPartial(false);
+      }
+      
+      if (stopped) proc.kill();
+    });
+    
+    // Diagnostics are capped too; a search over unreadable trees can
+    // print one error per file
+    proc.stderr.on('data', (chunk: Buffer) => {
+      if (stderrBytes >= MAX_OUTPUT_BYTES) return;
+      chunk = chunk.subarray(0, MAX_OUTPUT_BYTES - stderrBytes);
+      stderrChunks.push(chunk);
+      stderrBytes += chunk.length;
+    });
+    
+    proc.on('error', reject);
+    proc.on('close', (code) => {
+      // Output that does not end in a newline still counts as a final line
+      if (!stopped && partialBytes > 0) flushPartial(false);
+      
+      resolve({
+        stdout: Buffer.concat(stdoutChunks, bytes).toString('utf8'),
+        stderr: Buffer.concat(stderrChunks, stderrBytes).toString('utf8'),
+        code,
+        truncated,
+        stopped
+      });
+    });
+  });
+};
+
+// Exit code 1 means no matches. Exit code 2 is an error, but both grep and
+// ripgrep also return it for per-file failures (e.g. an unreadable
+// directory) after printing matches elsewhere, so keep any output collected.
+const searchFailed = ({ stdout, code, stopped }: SearchOutput): boolean => {
+  if (stopped || code === 0 || code === 1) return false;
+  return !(code === 2 && stdout);
 };
 
 export const grepTool: Tool = {
@@ -62,41 +239,50 @@ export const grepTool: Tool = {
     try {
       const useRipgrep = await hasRipgrep();
       let command: string;
+      let commandArgs: string[];
+      const limits: SearchLimits = {};
       
       if (useRipgrep) {
         command = 'rg';
-        if (args.ignoreCase) command += ' -i';
-        if (args.showLineNumbers) command += ' -n';
-        if (args.contextLines > 0) command += ` -C ${args.contextLines}`;
-        if (args.filePattern) command += ` -g "${args.filePattern}"`;
-        command += ` "${args.pattern}" "${args.path || '.'}"`;
+        commandArgs = [...RIPGREP_GUARD_ARGS];
+        if (args.ignoreCase) commandArgs.push('-i');
+        if (args.showLineNumbers) commandArgs.push('-n');
+        if (args.contextLines > 0) commandArgs.push('-C', String(args.contextLines));
+        if (args.filePattern) commandArgs.push('-g', args.filePattern);
       } else {
-        command = 'grep -r';
-        if (args.ignoreCase) command += ' -i';
-        if (args.showLineNumbers) command += ' -n';
-        if (args.contextLines > 0) command += ` -C ${args.contextLines}`;
-        if (args.filePattern) command += ` --include="${args.filePattern}"`;
-        command += ` "${args.pattern}" "${args.path || '.'}"`;
+        command = 'grep';
+        commandArgs = ['-r'];
+        if (args.ignoreCase) commandArgs.push('-i');
+        if (args.showLineNumbers) commandArgs.push('-n');
+        if (args.contextLines > 0) commandArgs.push('-C', String(args.contextLines));
+        if (args.filePattern) commandArgs.push(`--include=${args.filePattern}`);
+        limits.maxColumns = MAX_LINE_BYTES;
+      }
+      commandArgs.push('--', args.pattern, args.path || '.');
+      
+      const output = await runSearch(command, commandArgs, limits);
+      const { stdout, stderr, code, truncated } = output;
+      
+      if (searchFailed(output)) {
+        return {
+          content: [{
+            type: 'text',
+            text: `Error searching: ${stderr.trim() || `${command} exited with code ${code}`}`
+          }],
+          isError: true
+        };
       }
       
-      const { stdout } = await execAsync(command);
+      let text = stdout || 'No matches found';
+      if (truncated) text += '\n[Output truncated]';
       
       return {
         content: [{
           type: 'text',
-          text: stdout || 'No matches found'
+          text
         }]
       };
     } catch (error: any) {
-      if (error.code === 1) {
-        // No matches found
-        return {
-          content: [{
-            type: 'text',
-            text: 'No matches found'
-          }]
-        };
-      }
       return {
         content: [{
           type: 'text',
@@ -203,49 +389,65 @@ export const searchTool: Tool = {
     required: ['query']
   },
   handler: async (args) => {
-    const results: string[] = [];
-    
     try {
       // Search in filenames
-      if (args.type === 'all' || args.type === 'filename') {
+      const searchFilenames = async (): Promise<string[]> => {
+        if (args.type !== 'all' && args.type !== 'filename') return [];
+        
         const filePattern = `*${args.query}*`;
         const globPattern = path.join(args.path || '.', '**', filePattern);
         const files = await glob(globPattern, { maxDepth: 5 });
         
-        if (files.length > 0) {
-          results.push('=== Filename Matches ===');
-          results.push(...files.slice(0, args.maxResults || 50));
-          results.push('');
-        }
-      }
+        if (files.length === 0) return [];
+        return [
+          '=== Filename Matches ===',
+          ...files.slice(0, args.maxResults || 50),
+          ''
+        ];
+      };
       
       // Search in file contents
-      if (args.type === 'all' || args.type === 'code' || args.type === 'text') {
+      const searchContents = async (): Promise<string[]> => {
+        if (args.type !== 'all' && args.type !== 'code' && args.type !== 'text') return [];
+        
         const useRipgrep = await hasRipgrep();
+        const maxResults = args.maxResults || 50;
         let command: string;
+        let commandArgs: string[];
+        const limits: SearchLimits = {};
         
         if (useRipgrep) {
-          command = `rg -n --max-count ${args.maxResults || 50}`;
-          if (args.filePattern) command += ` -g "${args.filePattern}"`;
-          command += ` "${args.query}" "${args.path || '.'}"`;
+          command = 'rg';
+          commandArgs = [...RIPGREP_GUARD_ARGS, '-n', '--max-count', String(maxResults)];
+          if (args.filePattern) commandArgs.push('-g', args.filePattern);
         } else {
-          command = `grep -r -n`;
-          if (args.filePattern) command += ` --include="${args.filePattern}"`;
-          command += ` "${args.query}" "${args.path || '.'}" | head -${args.maxResults || 50}`;
+          command = 'grep';
+          commandArgs = ['-r', '-n'];
+          if (args.filePattern) commandArgs.push(`--include=${args.filePattern}`);
+          limits.maxLines = maxResults;
+          limits.maxColumns = MAX_LINE_BYTES;
         }
+        commandArgs.push('--', args.query, args.path || '.');
         
-        try {
-          const { stdout } = await execAsync(command);
-          if (stdout) {
-            results.push('=== Content Matches ===');
-            results.push(stdout.trim());
-          }
-        } catch (error: any) {
-          if (error.code !== 1) { // 1 means no matches, which is ok
-            throw error;
-          }
+        const output = await runSearch(command, commandArgs, limits);
+        const { stdout, stderr, code, truncated } = output;
+        if (searchFailed(output)) {
+          throw new Error(stderr.trim() || `${command} exited with code ${code}`);
         }
-      }
+        if (!stdout) return [];
+        
+        const matches = ['=== Content Matches ===', stdout.trim()];
+        if (truncated) matches.push('[Output truncated]');
+        return matches;
+      };
+      
+      // The filename walk and the content search are independent, so run
+      // them side by side; sections are still reported in a fixed order
+      const [filenameResults, contentResults] = await Promise.all([
+        searchFilenames(),
+        searchContents()
+      ]);
+      const results = [...filenameResults, ...contentResults];
       
       if (results.length === 0) {
         return {
@@ -2,15 +2,41 @@
  * Shell and command execution tools for Hanzo MCP
  */
 
-import { exec, spawn } from 'child_process';
+import { exec, spawn, ChildProcess } from 'child_process';
 import { promisify } from 'util';
 import * as os from 'os';
 import { Tool, ToolResult } from '../types';
 
 const execAsync = promisify(exec);
 
+interface BackgroundProcess {
+  process: ChildProcess;
+  output: Buffer[];
+  error: Buffer[];
+  exitCode: number | null | undefined;
+}
+
 // Store background processes
-const backgroundProcesses = new Map<string, any>();
+const backgroundProcesses = new Map<string, BackgroundProcess>();
+
+// Grace period before a process that ignores SIGTERM is sent SIGKILL
+const KILL_GRACE_MS = 2000;
+
+// Decode the last count chunks of a stream. Chunks are split wherever the
+// pipe read ended, so the first one kept may start partway through a
+// multi-byte character; its stray continuation bytes (10xxxxxx) are dropped
+// rather than decoded as U+FFFD.
+function decodeTail(chunks: Buffer[], count: number): string {
+  const tail = chunks.slice(-count);
+  if (tail.length > 0 && tail.length < chunks.length) {
+    let start = 0;
+    while (start < 3 && start < tail[0].length && (tail[0][start] & 0xc0) === 0x80) {
+      start++;
+    }
+    tail[0] = tail[0].subarray(start);
+  }
+  return Buffer.concat(tail).toString('utf8');
+}
 
 export const bashTool: Tool = {
   name: 'bash',
@@ -43,7 +69,8 @@ export const bashTool: Tool = {
       const options: any = {
         cwd: args.cwd,
         timeout: args.timeout || 30000,
-        env: { ...process.env, ...args.env },
+        // Only copy the environment when there are overrides to layer on top
+        env: args.env ? { ...process.env, ...args.env } : process.env,
         maxBuffer: 10 * 1024 * 1024 // 10MB
       };
       
@@ -118,20 +145,22 @@ export const runBackgroundTool: Tool = {
         stdio: 'pipe'
       });
       
-      backgroundProcesses.set(args.id, {
+      // All fields are set up front so every record has the same shape
+      const procData: BackgroundProcess = {
         process: proc,
         output: [],
-        error: []
-      });
-      
-      const procData = backgroundProcesses.get(args.id);
+        error: [],
+        exitCode: undefined
+      };
+      backgroundProcesses.set(args.id, procData);
       
-      proc.stdout?.on('data', (data) => {
-        procData.output.push(data.toString());
+      // Keep raw chunks; they are only decoded when output is requested
+      proc.stdout?.on('data', (data: Buffer) => {
+        procData.output.push(data);
       });
       
-      proc.stderr?.on('data', (data) => {
-        procData.error.push(data.toString());
+      proc.stderr?.on('data', (data: Buffer) => {
+        procData.error.push(data);
       });
       
       proc.on('exit', (code) => {
@@ -224,8 +253,8 @@ export const getProcessOutputTool: Tool = {
       };
     }
     
-    const output = procData.output.slice(-(args.tail || 50)).join('');
-    const error = procData.error.slice(-(args.tail || 50)).join('');
+    const output = decodeTail(procData.output, args.tail || 50);
+    const error = decodeTail(procData.error, args.tail || 50);
     
     let result = '';
     if (output) result += 'Output:\n' + output;
@@ -268,7 +297,18 @@ export const killProcessTool: Tool = {
     }
     
     try {
-      procData.process.kill();
+      const proc = procData.process;
+      proc.kill();
+      
+      // Escalate in the background so the caller is not held up waiting
+      const escalate = setTimeout(() => {
+        if (proc.exitCode === null && proc.signalCode === null) {
+          proc.kill('SIGKILL');
+        }
+      }, KILL_GRACE_MS);
+      escalate.unref();
+      proc.once('exit', () => clearTimeout(escalate));
+      
       backgroundProcesses.delete(args.id);
       
       return {